@@ -1,13 +1,31 @@
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
+from abap_rag.batching import QueryBatcher
 from abap_rag.pipeline import RagPipeline
 from abap_rag.settings import settings
 
-app = FastAPI(title="SAP ABAP RAG System", version="0.1.0")
 pipeline = RagPipeline(settings)
+batcher = QueryBatcher(pipeline.retriever.retrieve_many)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Run one forward pass up front so the first request does not pay for
+    # lazy initialization (or torch.compile tracing when it is enabled).
+    await asyncio.to_thread(pipeline.embedder.encode, ["warm up"])
+    batcher.start()
+    try:
+        yield
+    finally:
+        await batcher.stop()
+
+
+app = FastAPI(title="SAP ABAP RAG System", version="0.1.0", lifespan=lifespan)
 
 
 class IngestRequest(BaseModel):
@@ -19,24 +37,28 @@ class AskRequest(BaseModel):
 
 
 @app.get("/health")
-def health() -> dict[str, str]:
+async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
 @app.post("/ingest")
-def ingest(payload: IngestRequest) -> dict:
+async def ingest(payload: IngestRequest) -> dict:
     docs_path = Path(payload.path)
     try:
-        count = pipeline.ingest(docs_path)
+        count = await asyncio.to_thread(pipeline.ingest, docs_path)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     return {"indexed_chunks": count, "path": str(docs_path)}
 
 
 @app.post("/ask")
-def ask(payload: AskRequest) -> dict:
+async def ask(payload: AskRequest) -> dict:
     try:
-        pipeline.load_index()
-        return pipeline.ask(payload.query)
+        await asyncio.to_thread(pipeline.refresh_index)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=400, detail="Index not found. Run /ingest first.") from exc
+    except RuntimeError as exc:
+        # A save was still in progress after the load retries; the old index stays loaded.
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    rows = await batcher.retrieve(payload.query)
+    return pipeline.answer(payload.query, rows)
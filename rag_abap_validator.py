@@ -11,10 +11,10 @@ import argparse
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Set, Tuple
 
 
-REQUIRED_DESIGN_KEYS = {
+REQUIRED_DESIGN_KEYS = frozenset({
     "data_sources",
     "chunking",
     "embeddings",
@@ -23,16 +23,20 @@ REQUIRED_DESIGN_KEYS = {
     "generation",
     "evaluation",
     "feedback_loop",
-}
+})
 
-REQUIRED_METADATA_FIELDS = {
+REQUIRED_METADATA_FIELDS = frozenset({
     "doc_id",
     "doc_type",
     "module",
     "requirement_id",
     "version",
     "language",
-}
+})
+
+REQUIRED_DOC_TYPES = frozenset({"ABAP Functional Spec", "ABAP Technical Spec", "Requirement Document"})
+
+REQUIRED_EVAL_METRICS = frozenset({"groundedness", "answer_correctness", "retrieval_recall_at_k"})
 
 
 @dataclass
@@ -62,90 +66,35 @@ class ABAPRAGValidator:
         self.design = design
 
     def evaluate(self) -> List[CheckResult]:
-        checks = [
-            self._check_top_level_sections(),
-            self._check_data_sources(),
-            self._check_chunking(),
-            self._check_metadata(),
-            self._check_retrieval_strategy(),
-            self._check_evaluation(),
-            self._check_feedback_loop(),
-            self._check_security_for_enterprise_docs(),
-        ]
-        return checks
+        return [check(self) for check in self._CHECKS.values()]
+
+    def reevaluate(self, previous: List[CheckResult], names: Set[str]) -> List[CheckResult]:
+        """Re-run only the named checks, reusing the other results from ``previous``."""
+        return [self._CHECKS[c.name](self) if c.name in names else c for c in previous]
 
     def apply_fixes(self, checks: List[CheckResult]) -> List[str]:
         fixes_applied: List[str] = []
         for check in checks:
             if check.passed or not check.fix:
                 continue
-            if check.fix == "add_missing_top_sections":
-                for key in REQUIRED_DESIGN_KEYS:
-                    self.design.setdefault(key, {})
-                fixes_applied.append("Added missing top-level design sections")
-            elif check.fix == "ensure_abap_and_requirements_sources":
-                sources = self.design.setdefault("data_sources", {})
-                docs = sources.setdefault("supported_doc_types", [])
-                for needed in ["ABAP Functional Spec", "ABAP Technical Spec", "Requirement Document"]:
-                    if needed not in docs:
-                        docs.append(needed)
-                sources.setdefault("ingestion_frequency", "daily")
-                fixes_applied.append("Added SAP ABAP and requirement-document source coverage")
-            elif check.fix == "fix_chunking":
-                chunking = self.design.setdefault("chunking", {})
-                chunking["strategy"] = "section_aware"
-                chunking["max_tokens"] = min(max(chunking.get("max_tokens", 800), 300), 1200)
-                chunking["overlap_tokens"] = max(50, min(chunking.get("overlap_tokens", 120), 250))
-                fixes_applied.append("Normalized chunking strategy and token window")
-            elif check.fix == "add_metadata_fields":
-                retr = self.design.setdefault("retrieval", {})
-                metadata = retr.setdefault("metadata_fields", [])
-                for field in REQUIRED_METADATA_FIELDS:
-                    if field not in metadata:
-                        metadata.append(field)
-                fixes_applied.append("Added ABAP requirement metadata fields")
-            elif check.fix == "strengthen_retrieval":
-                retr = self.design.setdefault("retrieval", {})
-                retr["mode"] = "hybrid"
-                retr["reranker"] = retr.get("reranker") or "cross_encoder"
-                retr["top_k"] = max(8, int(retr.get("top_k", 0) or 0))
-                retr.setdefault("filters", ["module", "language", "version"]) 
-                fixes_applied.append("Enabled hybrid retrieval with reranking and filters")
-            elif check.fix == "add_eval_metrics":
-                ev = self.design.setdefault("evaluation", {})
-                metrics = ev.setdefault("metrics", {})
-                metrics["groundedness"] = max(float(metrics.get("groundedness", 0.0)), 0.85)
-                metrics.setdefault("answer_correctness", 0.80)
-                metrics.setdefault("retrieval_recall_at_k", 0.75)
-                ev["golden_set_size"] = max(int(ev.get("golden_set_size", 0) or 0), 100)
-                fixes_applied.append("Added evaluation metrics and baseline target sizes")
-            elif check.fix == "add_feedback_loop":
-                fb = self.design.setdefault("feedback_loop", {})
-                fb.setdefault("capture_user_feedback", True)
-                fb.setdefault("error_taxonomy", ["hallucination", "missed_requirement", "stale_version"])
-                fb.setdefault("reindex_trigger", "on_document_update")
-                fb.setdefault("prompt_revision_cycle", "weekly")
-                fixes_applied.append("Added evaluation-to-improvement feedback loop")
-            elif check.fix == "add_security_controls":
-                gen = self.design.setdefault("generation", {})
-                gen.setdefault("citation_required", True)
-                sec = self.design.setdefault("security", {})
-                sec.setdefault("row_level_security", True)
-                sec.setdefault("pii_redaction", True)
-                sec.setdefault("audit_logging", True)
-                fixes_applied.append("Added enterprise document security controls")
+            fix = self._FIXES.get(check.fix)
+            if fix is not None:
+                fixes_applied.append(fix(self))
         return fixes_applied
 
     def run_improvement_loop(self, max_iterations: int = 3, apply_fixes: bool = True) -> List[IterationReport]:
         reports: List[IterationReport] = []
+        checks = self.evaluate()
         for i in range(1, max_iterations + 1):
-            checks = self.evaluate()
             fixes: List[str] = []
             if apply_fixes and not all(c.passed for c in checks):
                 fixes = self.apply_fixes(checks)
             reports.append(IterationReport(iteration=i, checks=checks, fixes_applied=fixes))
-            if all(c.passed for c in checks):
+            if all(c.passed for c in checks) or not fixes:
                 break
+            # Fixes only add or tighten settings, so passing checks stay passing;
+            # only the checks that were just fixed need to run again.
+            checks = self.reevaluate(checks, {c.name for c in checks if not c.passed and c.fix})
         return reports
 
     def _check_top_level_sections(self) -> CheckResult:
@@ -162,8 +111,7 @@ class ABAPRAGValidator:
     def _check_data_sources(self) -> CheckResult:
         sources = self.design.get("data_sources", {})
         supported = set(sources.get("supported_doc_types", []))
-        needed = {"ABAP Functional Spec", "ABAP Technical Spec", "Requirement Document"}
-        missing = sorted(needed - supported)
+        missing = sorted(REQUIRED_DOC_TYPES - supported)
         if missing:
             return CheckResult(
                 "data_sources",
@@ -217,8 +165,7 @@ class ABAPRAGValidator:
     def _check_evaluation(self) -> CheckResult:
         evaluation = self.design.get("evaluation", {})
         metrics = evaluation.get("metrics", {})
-        required = {"groundedness", "answer_correctness", "retrieval_recall_at_k"}
-        missing = sorted(required - set(metrics.keys()))
+        missing = sorted(REQUIRED_EVAL_METRICS - metrics.keys())
         if missing or evaluation.get("golden_set_size", 0) < 50:
             return CheckResult(
                 "evaluation",
@@ -251,6 +198,93 @@ class ABAPRAGValidator:
             )
         return CheckResult("security", True, "Security and citation controls are configured")
 
+    def _fix_top_level_sections(self) -> str:
+        for key in REQUIRED_DESIGN_KEYS:
+            self.design.setdefault(key, {})
+        return "Added missing top-level design sections"
+
+    def _fix_data_sources(self) -> str:
+        sources = self.design.setdefault("data_sources", {})
+        docs = sources.setdefault("supported_doc_types", [])
+        for needed in sorted(REQUIRED_DOC_TYPES):
+            if needed not in docs:
+                docs.append(needed)
+        sources.setdefault("ingestion_frequency", "daily")
+        return "Added SAP ABAP and requirement-document source coverage"
+
+    def _fix_chunking(self) -> str:
+        chunking = self.design.setdefault("chunking", {})
+        chunking["strategy"] = "section_aware"
+        chunking["max_tokens"] = min(max(chunking.get("max_tokens", 800), 300), 1200)
+        chunking["overlap_tokens"] = max(50, min(chunking.get("overlap_tokens", 120), 250))
+        return "Normalized chunking strategy and token window"
+
+    def _fix_metadata(self) -> str:
+        retr = self.design.setdefault("retrieval", {})
+        metadata = retr.setdefault("metadata_fields", [])
+        for field in REQUIRED_METADATA_FIELDS:
+            if field not in metadata:
+                metadata.append(field)
+        return "Added ABAP requirement metadata fields"
+
+    def _fix_retrieval_strategy(self) -> str:
+        retr = self.design.setdefault("retrieval", {})
+        retr["mode"] = "hybrid"
+        retr["reranker"] = retr.get("reranker") or "cross_encoder"
+        retr["top_k"] = max(8, int(retr.get("top_k", 0) or 0))
+        retr.setdefault("filters", ["module", "language", "version"])
+        return "Enabled hybrid retrieval with reranking and filters"
+
+    def _fix_evaluation(self) -> str:
+        ev = self.design.setdefault("evaluation", {})
+        metrics = ev.setdefault("metrics", {})
+        metrics["groundedness"] = max(float(metrics.get("groundedness", 0.0)), 0.85)
+        metrics.setdefault("answer_correctness", 0.80)
+        metrics.setdefault("retrieval_recall_at_k", 0.75)
+        ev["golden_set_size"] = max(int(ev.get("golden_set_size", 0) or 0), 100)
+        return "Added evaluation metrics and baseline target sizes"
+
+    def _fix_feedback_loop(self) -> str:
+        fb = self.design.setdefault("feedback_loop", {})
+        fb.setdefault("capture_user_feedback", True)
+        fb.setdefault("error_taxonomy", ["hallucination", "missed_requirement", "stale_version"])
+        fb.setdefault("reindex_trigger", "on_document_update")
+        fb.setdefault("prompt_revision_cycle", "weekly")
+        return "Added evaluation-to-improvement feedback loop"
+
+    def _fix_security(self) -> str:
+        gen = self.design.setdefault("generation", {})
+        gen.setdefault("citation_required", True)
+        sec = self.design.setdefault("security", {})
+        sec.setdefault("row_level_security", True)
+        sec.setdefault("pii_redaction", True)
+        sec.setdefault("audit_logging", True)
+        return "Added enterprise document security controls"
+
+    # Check name -> method, in report order.
+    _CHECKS: Dict[str, Callable[["ABAPRAGValidator"], CheckResult]] = {
+        "top_level_sections": _check_top_level_sections,
+        "data_sources": _check_data_sources,
+        "chunking": _check_chunking,
+        "metadata": _check_metadata,
+        "retrieval_strategy": _check_retrieval_strategy,
+        "evaluation": _check_evaluation,
+        "feedback_loop": _check_feedback_loop,
+        "security": _check_security_for_enterprise_docs,
+    }
+
+    # Fix id -> method that applies it and returns a summary line.
+    _FIXES: Dict[str, Callable[["ABAPRAGValidator"], str]] = {
+        "add_missing_top_sections": _fix_top_level_sections,
+        "ensure_abap_and_requirements_sources": _fix_data_sources,
+        "fix_chunking": _fix_chunking,
+        "add_metadata_fields": _fix_metadata,
+        "strengthen_retrieval": _fix_retrieval_strategy,
+        "add_eval_metrics": _fix_evaluation,
+        "add_feedback_loop": _fix_feedback_loop,
+        "add_security_controls": _fix_security,
+    }
+
 
 def load_json(path: Path) -> Dict[str, Any]:
     with path.open("r", encoding="utf-8") as f:
@@ -0,0 +1,35 @@
+"""Optional compiled build of the design validator.
+
+Metadata lives in pyproject.toml. When Cython is installed, ``rag_abap_validator``
+is compiled to an extension module; build it next to the source with::
+
+    python setup.py build_ext --inplace
+
+Python imports the extension ahead of the ``.py`` file, and falls back to the
+pure-Python module when no extension has been built.
+"""
+
+from pathlib import Path
+
+from setuptools import setup
+from setuptools.command.build_ext import build_ext
+
+ROOT = Path(__file__).resolve().parent
+
+
+class RootBuildExt(build_ext):
+    # The validator is a top-level module, so in-place builds must not land under src/.
+    def copy_extensions_to_source(self) -> None:
+        for ext in self.extensions:
+            filename = self.get_ext_filename(self.get_ext_fullname(ext.name))
+            self.copy_file(str(Path(self.build_lib) / filename), str(ROOT / filename), level=self.verbose)
+
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(["rag_abap_validator.py"], language_level=3)
+
+setup(ext_modules=ext_modules, cmdclass={"build_ext": RootBuildExt})
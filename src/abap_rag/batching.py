@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import Callable
+
+from .models import RetrievedChunk
+
+
+class QueryBatcher:
+    """Coalesces queries that arrive within a short window into one batched retrieval call.
+
+    ``start()`` and ``stop()`` must run on the event loop that serves ``retrieve()``,
+    e.g. from an application lifespan hook; the queue and worker task belong to that loop.
+    """
+
+    def __init__(
+        self,
+        retrieve_many: Callable[[list[str]], list[list[RetrievedChunk]]],
+        window_s: float = 0.005,
+        max_batch: int = 32,
+    ):
+        self.retrieve_many = retrieve_many
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future]] | None = None
+        self._worker: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._worker is not None and not self._worker.done():
+            raise RuntimeError("QueryBatcher is already running")
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._worker
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            _fail(future, RuntimeError("QueryBatcher stopped"))
+        self._worker = None
+        self._queue = None
+
+    async def retrieve(self, query: str) -> list[RetrievedChunk]:
+        if self._worker is None or self._worker.done():
+            raise RuntimeError("QueryBatcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                deadline = loop.time() + self.window_s
+                while len(batch) < self.max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                results = await asyncio.to_thread(self.retrieve_many, [query for query, _ in batch])
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    _fail(future, RuntimeError("QueryBatcher stopped"))
+                raise
+            except Exception as exc:
+                for _, future in batch:
+                    _fail(future, exc)
+                continue
+            for (_, future), rows in zip(batch, results):
+                if not future.done():
+                    future.set_result(rows)
+
+
+def _fail(future: asyncio.Future, exc: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exc)
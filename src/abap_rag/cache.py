@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .models import RetrievedChunk
+
+
+class SemanticQueryCache:
+    """LRU cache of retrieval results keyed by query text or a near-duplicate embedding.
+
+    Embeddings are expected to be L2-normalized, so a dot product against the
+    cached matrix gives cosine similarity. All methods are thread-safe. ``clear()``
+    bumps ``generation``; results computed before a clear are dropped by ``put``.
+    """
+
+    def __init__(self, capacity: int, threshold: float):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._reset()
+
+    def _reset(self) -> None:
+        self._slots: OrderedDict[str, int] = OrderedDict()
+        self._keys: list[str] = []
+        self._results: list[list[RetrievedChunk]] = []
+        self._matrix: np.ndarray | None = None
+
+    def get(self, query: str) -> list[RetrievedChunk] | None:
+        with self._lock:
+            slot = self._slots.get(query)
+            if slot is None:
+                return None
+            self._slots.move_to_end(query)
+            return list(self._results[slot])
+
+    def get_similar(self, embedding: np.ndarray) -> list[RetrievedChunk] | None:
+        with self._lock:
+            if self._matrix is None or not self._keys:
+                return None
+            sims = self._matrix[: len(self._keys)] @ embedding
+            slot = int(np.argmax(sims))
+            if sims[slot] < self.threshold:
+                return None
+            self._slots.move_to_end(self._keys[slot])
+            return list(self._results[slot])
+
+    def put(
+        self,
+        query: str,
+        embedding: np.ndarray,
+        results: list[RetrievedChunk],
+        generation: int | None = None,
+    ) -> None:
+        """Store ``results``; skipped if ``generation`` is given and a clear happened since."""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if self._matrix is None:
+                self._matrix = np.zeros((self.capacity, embedding.shape[0]), dtype="float32")
+
+            slot = self._slots.get(query)
+            if slot is not None:
+                self._slots.move_to_end(query)
+            elif len(self._keys) < self.capacity:
+                slot = len(self._keys)
+                self._keys.append(query)
+                self._results.append([])
+                self._slots[query] = slot
+            else:
+                _, slot = self._slots.popitem(last=False)
+                self._keys[slot] = query
+                self._slots[query] = slot
+
+            self._matrix[slot] = embedding
+            self._results[slot] = list(results)
@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import re
+
 from .models import DocumentChunk
 
+# The separators str.splitlines() breaks on, so the first line matches it exactly.
+_LINE_BREAK = re.compile(r"[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
 
 def _title_from_text(text: str) -> str:
+    end = _LINE_BREAK.search(text)
+    clean = (text if end is None else text[: end.start()]).strip("# ").strip()
+    if clean:
+        return clean[:80]
+    # First line was only markup; fall back to scanning the rest.
     for line in text.splitlines():
         clean = line.strip("# ").strip()
         if clean:
@@ -15,22 +25,13 @@ def chunk_document(source: str, text: str, chunk_size: int, overlap: int) -> lis
     if chunk_size <= overlap:
         raise ValueError("chunk_size must be greater than overlap")
 
-    chunks: list[DocumentChunk] = []
-    start = 0
-    idx = 0
-    while start < len(text):
-        end = min(start + chunk_size, len(text))
-        body = text[start:end].strip()
-        if body:
-            chunks.append(
-                DocumentChunk(
-                    chunk_id=f"{source}:{idx}",
-                    source=source,
-                    title=_title_from_text(body),
-                    text=body,
-                )
-            )
-            idx += 1
-        start += chunk_size - overlap
-
-    return chunks
+    bodies = [text[start : start + chunk_size].strip() for start in range(0, len(text), chunk_size - overlap)]
+    return [
+        DocumentChunk(
+            chunk_id=f"{source}:{idx}",
+            source=source,
+            title=_title_from_text(body),
+            text=body,
+        )
+        for idx, body in enumerate(b for b in bodies if b)
+    ]
@@ -1,13 +1,106 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 
+# Stay under SQLite's default host-parameter limit for "IN (...)" lookups.
+_SQLITE_BATCH = 900
+
+
+def _torch_version() -> tuple[int, ...]:
+    return tuple(int(part) for part in torch.__version__.split("+")[0].split(".")[:2])
+
 
 class Embedder:
-    def __init__(self, model_name: str):
-        self.model = SentenceTransformer(model_name)
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = 64,
+        device: str | None = None,
+        num_threads: int | None = None,
+        compile_model: bool = False,
+        compile_cache_dir: Path | None = None,
+    ):
+        self.model_name = model_name
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        if self.device == "cpu":
+            # Leave half the cores for ingestion workers instead of one intra-op thread per core.
+            torch.set_num_threads(num_threads or max(1, (os.cpu_count() or 1) // 2))
+        self.model = SentenceTransformer(model_name, device=self.device)
+        if self.device.startswith("cuda"):
+            self.model.half()
+        if compile_model and _torch_version() >= (2, 1):
+            self._compile(compile_cache_dir)
+        self.batch_size = batch_size
+
+    def _compile(self, cache_dir: Path | None) -> None:
+        # Inductor reuses compiled kernels from this directory across processes.
+        if cache_dir is not None:
+            os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(cache_dir))
+        transformer = self.model[0]
+        if hasattr(transformer, "auto_model"):
+            transformer.auto_model = torch.compile(transformer.auto_model, mode="reduce-overhead", dynamic=True)
 
     def encode(self, texts: list[str]) -> np.ndarray:
-        vecs = self.model.encode(texts, show_progress_bar=False, normalize_embeddings=True)
+        # SentenceTransformer.encode already length-sorts inputs within the call.
+        with torch.inference_mode():
+            vecs = self.model.encode(
+                texts,
+                batch_size=self.batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            )
         return np.asarray(vecs, dtype="float32")
+
+class CachedEmbedder:
+    """Embedder wrapper that persists vectors in SQLite keyed by sha256 of the text."""
+
+    def __init__(self, embedder: Embedder, cache_path: Path):
+        self.embedder = embedder
+        self.cache_path = cache_path
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        if not texts:
+            return self.embedder.encode(texts)
+
+        hashes = [hashlib.sha256(t.encode("utf-8")).digest() for t in texts]
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.cache_path)) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, hash BLOB NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, hash))"
+            )
+            found = self._fetch(conn, list(set(hashes)))
+            misses = {h: t for h, t in zip(hashes, texts) if h not in found}
+            if misses:
+                vecs = self.embedder.encode(list(misses.values()))
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (model, hash, vector) VALUES (?, ?, ?)",
+                        [(self.embedder.model_name, h, v.tobytes()) for h, v in zip(misses, vecs)],
+                    )
+                found.update(zip(misses, vecs))
+
+        return np.vstack([found[h] for h in hashes])
+
+    def _fetch(self, conn: sqlite3.Connection, hashes: list[bytes]) -> dict[bytes, np.ndarray]:
+        found: dict[bytes, np.ndarray] = {}
+        for i in range(0, len(hashes), _SQLITE_BATCH):
+            batch = hashes[i : i + _SQLITE_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({placeholders})",
+                [self.embedder.model_name, *batch],
+            )
+            for h, blob in rows:
+                found[h] = np.frombuffer(blob, dtype="float32")
+        return found
@@ -13,9 +13,13 @@ class PromptGenerator:
 
         lines = [f"Question: {query}", "", "Relevant ABAP context:"]
         for i, row in enumerate(contexts, start=1):
-            lines.append(f"[{i}] Source: {row.chunk.source} | Score: {row.score:.3f}")
-            lines.append(row.chunk.text.replace("\n", " ")[:500])
-            lines.append("")
+            lines.extend(
+                (
+                    f"[{i}] Source: {row.chunk.source} | Score: {row.score:.3f}",
+                    row.chunk.text[:500].replace("\n", " "),
+                    "",
+                )
+            )
 
         lines.append("Draft answer:")
         lines.append(
@@ -1,17 +1,38 @@
 from __future__ import annotations
 
+import mmap
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 
+READ_WORKERS = 16
 
-def load_text_documents(path: Path) -> dict[str, str]:
-    """Load .txt, .md, and .abap files from a folder recursively."""
+
+def _read_text(file: Path) -> str:
+    with file.open("rb") as f:
+        # mmap rejects zero-length files.
+        if f.seek(0, 2) == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(memoryview(mm), "utf-8", "ignore")
+    # Match read_text()'s universal-newline handling.
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _iter_documents(files: Iterator[Path]) -> Iterator[tuple[str, str]]:
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+        # Read one window of files at a time so only that window is held in memory.
+        for window in iter(lambda: list(islice(files, READ_WORKERS)), []):
+            yield from zip(map(str, window), pool.map(_read_text, window))
+
+
+def load_text_documents(path: Path) -> Iterator[tuple[str, str]]:
+    """Lazily yield (source, text) for .txt, .md, and .abap files in a folder, recursively."""
     if not path.exists():
         raise FileNotFoundError(f"Document path not found: {path}")
 
-    docs: dict[str, str] = {}
-    for file in path.rglob("*"):
-        if file.suffix.lower() not in {".txt", ".md", ".abap"}:
-            continue
-        docs[str(file)] = file.read_text(encoding="utf-8", errors="ignore")
-
-    return docs
+    files = (file for file in path.rglob("*") if file.suffix.lower() in {".txt", ".md", ".abap"})
+    return _iter_documents(files)
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 
 
@@ -8,6 +10,19 @@ class DocumentChunk:
     title: str
     text: str
 
+    @classmethod
+    def fast_from_dict(cls, d: dict[str, str], text: str | None = None) -> DocumentChunk:
+        """Rehydrate a trusted stored record without going through ``__init__``.
+
+        ``text`` is taken from ``d`` unless passed separately.
+        """
+        obj = cls.__new__(cls)
+        obj.chunk_id = d["chunk_id"]
+        obj.source = d["source"]
+        obj.title = d["title"]
+        obj.text = d["text"] if text is None else text
+        return obj
+
 
 @dataclass(slots=True)
 class RetrievedChunk:
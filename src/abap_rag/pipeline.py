@@ -1,50 +1,111 @@
 from __future__ import annotations
 
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
 
+from .cache import SemanticQueryCache
 from .chunker import chunk_document
-from .embedder import Embedder
+from .embedder import CachedEmbedder, Embedder
 from .generator import PromptGenerator
 from .loader import load_text_documents
+from .models import DocumentChunk, RetrievedChunk
 from .retriever import Retriever
 from .settings import Settings
 from .vector_store import VectorStore
 
+INGEST_DOC_WINDOW = 64
+
 
 class RagPipeline:
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.embedder = Embedder(settings.embedding_model_name)
+        self.embedder = Embedder(
+            settings.embedding_model_name,
+            batch_size=settings.embedding_batch_size,
+            device=settings.embedding_device,
+            num_threads=settings.embedding_threads,
+            compile_model=settings.embedding_compile,
+            compile_cache_dir=settings.embedding_compile_cache_dir,
+        )
+        self.chunk_embedder = CachedEmbedder(self.embedder, settings.embedding_cache_path)
         self.vector_store = VectorStore(settings.index_path, settings.metadata_path)
+        self.query_cache = SemanticQueryCache(
+            capacity=settings.query_cache_size,
+            threshold=settings.query_cache_threshold,
+        )
         self.retriever = Retriever(
             embedder=self.embedder,
             vector_store=self.vector_store,
             top_k=settings.top_k,
+            cache=self.query_cache,
         )
 
     def ingest(self, docs_path: Path) -> int:
+        """Chunk, embed, and index every document under ``docs_path``.
+
+        Windows of documents larger than ``ingest_parallel_min_chars`` are chunked on a
+        process pool. Its workers use the spawn start method, which re-imports the
+        caller's ``__main__`` module, so scripts that call this must guard their entry
+        point with ``if __name__ == "__main__":``. Set ``ingest_workers=1`` to always
+        chunk in-process.
+        """
         docs = load_text_documents(docs_path)
-        all_chunks = []
-        for source, text in docs.items():
-            all_chunks.extend(
-                chunk_document(
-                    source=source,
-                    text=text,
-                    chunk_size=self.settings.chunk_size,
-                    overlap=self.settings.chunk_overlap,
-                )
-            )
-
-        embeddings = self.embedder.encode([c.text for c in all_chunks])
-        self.vector_store.build(embeddings=embeddings, chunks=all_chunks)
+        chunker = partial(
+            chunk_document,
+            chunk_size=self.settings.chunk_size,
+            overlap=self.settings.chunk_overlap,
+        )
+        workers = self.settings.ingest_workers or os.cpu_count() or 1
+        all_chunks: list[DocumentChunk] = []
+        with ExitStack() as stack:
+            pool: ProcessPoolExecutor | None = None
+            # Hand documents over one window at a time so only that window's texts are in flight.
+            for window in iter(lambda: list(islice(docs, INGEST_DOC_WINDOW)), []):
+                sources, texts = zip(*window)
+                if workers > 1 and sum(map(len, texts)) >= self.settings.ingest_parallel_min_chars:
+                    if pool is None:
+                        # spawn rather than fork: the parent holds the transformer and torch threads.
+                        pool = stack.enter_context(
+                            ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+                        )
+                    results = pool.map(chunker, sources, texts)
+                else:
+                    # Small windows: slicing is cheaper than pickling documents to workers and back.
+                    results = map(chunker, sources, texts)
+                all_chunks.extend(chain.from_iterable(results))
+
+        # Embed and index in fixed-size batches so only one batch of vectors is held at a time.
+        # CachedEmbedder sends each distinct text to the model once per batch and serves
+        # repeats from earlier batches from its content-hash cache, so duplicated
+        # boilerplate chunks are never re-encoded.
+        step = self.settings.ingest_batch_size
+        batches = (
+            self.chunk_embedder.encode([c.text for c in all_chunks[i : i + step]])
+            for i in range(0, len(all_chunks), step)
+        )
+        self.vector_store.build_from_batches(batches, all_chunks)
         self.vector_store.save()
+        self.query_cache.clear()
         return len(all_chunks)
 
     def load_index(self) -> None:
         self.vector_store.load()
+        self.query_cache.clear()
+
+    def refresh_index(self) -> None:
+        """Load the index if none is loaded or it was rebuilt on disk since the last load."""
+        if self.vector_store.is_stale():
+            self.load_index()
 
     def ask(self, query: str) -> dict:
-        rows = self.retriever.retrieve(query)
+        return self.answer(query, self.retriever.retrieve(query))
+
+    def answer(self, query: str, rows: list[RetrievedChunk]) -> dict:
         answer = PromptGenerator.generate(query, rows)
         return {
             "query": query,
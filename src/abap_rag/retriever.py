@@ -1,16 +1,53 @@
 from __future__ import annotations
 
-from .embedder import Embedder
+from typing import TYPE_CHECKING
+
+from .cache import SemanticQueryCache
 from .models import RetrievedChunk
 from .vector_store import VectorStore
 
+if TYPE_CHECKING:
+    from .embedder import Embedder
+
 
 class Retriever:
-    def __init__(self, embedder: Embedder, vector_store: VectorStore, top_k: int):
+    def __init__(
+        self,
+        embedder: Embedder,
+        vector_store: VectorStore,
+        top_k: int,
+        cache: SemanticQueryCache | None = None,
+    ):
         self.embedder = embedder
         self.vector_store = vector_store
         self.top_k = top_k
+        self.cache = cache
 
     def retrieve(self, query: str) -> list[RetrievedChunk]:
-        query_embedding = self.embedder.encode([query])
-        return self.vector_store.search(query_embedding=query_embedding, top_k=self.top_k)
+        return self.retrieve_many([query])[0]
+
+    def retrieve_many(self, queries: list[str]) -> list[list[RetrievedChunk]]:
+        """Retrieve for several queries with one encode call and one index search for all cache misses."""
+        # Captured before searching so results from an index swapped out mid-call are not cached.
+        generation = self.cache.generation if self.cache is not None else None
+        results = [self.cache.get(q) if self.cache is not None else None for q in queries]
+        misses = [i for i, rows in enumerate(results) if rows is None]
+        if not misses:
+            return results
+
+        embeddings = self.embedder.encode([queries[i] for i in misses])
+        pending: list[int] = []
+        for j, i in enumerate(misses):
+            rows = self.cache.get_similar(embeddings[j]) if self.cache is not None else None
+            if rows is None:
+                pending.append(j)
+            else:
+                results[i] = rows
+
+        if pending:
+            found = self.vector_store.search_many(embeddings[pending], top_k=self.top_k)
+            for j, rows in zip(pending, found):
+                results[misses[j]] = rows
+                if self.cache is not None:
+                    self.cache.put(queries[misses[j]], embeddings[j], rows, generation=generation)
+        return results
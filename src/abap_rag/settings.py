@@ -7,11 +7,22 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="ABAP_RAG_", extra="ignore")
 
     embedding_model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_batch_size: int = 64
+    embedding_device: str | None = None
+    embedding_threads: int | None = None
+    embedding_compile: bool = False
+    embedding_compile_cache_dir: Path = Path(".rag_store/torch_compile")
+    ingest_batch_size: int = 512
+    ingest_workers: int | None = None
+    ingest_parallel_min_chars: int = 4_000_000
     chunk_size: int = 900
     chunk_overlap: int = 120
     top_k: int = 4
+    query_cache_size: int = 1024
+    query_cache_threshold: float = 0.97
     index_path: Path = Path(".rag_store/faiss.index")
     metadata_path: Path = Path(".rag_store/metadata.json")
+    embedding_cache_path: Path = Path(".rag_store/embeddings.sqlite")
 
 
 settings = Settings()
@@ -1,52 +1,210 @@
 from __future__ import annotations
 
 import json
+import mmap
+import operator
+import os
+import time
+from collections.abc import Callable, Iterable, Sequence
 from pathlib import Path
+from typing import BinaryIO
 
 import faiss
 import numpy as np
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
 from .models import DocumentChunk, RetrievedChunk
 
+# Below this many chunks an exact flat scan is cheap enough; above it use an HNSW graph.
+HNSW_MIN_CHUNKS = 2048
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+# Above this many chunks, compress vectors with IVF + product quantization.
+IVFPQ_MIN_CHUNKS = 50_000
+IVFPQ_NLIST = 1024
+IVFPQ_M = 48
+IVFPQ_NBITS = 8
+IVFPQ_NPROBE = 16
+IVFPQ_TRAIN_SIZE = 64 * IVFPQ_NLIST
+
+# A load racing a concurrent save can read files from two generations; retry before giving up.
+LOAD_ATTEMPTS = 3
+LOAD_RETRY_DELAY = 0.05
+
+
+class _ChunkTable(Sequence[DocumentChunk]):
+    """Read-only chunk list that decodes text from a memory-mapped UTF-8 blob on access."""
+
+    def __init__(self, records: list[dict], offsets: np.ndarray, texts: mmap.mmap | bytes):
+        self._records = records
+        self._offsets = offsets
+        self._texts = texts
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        i = operator.index(i)
+        if i < 0:
+            i += len(self)
+        text = self._texts[self._offsets[i] : self._offsets[i + 1]].decode("utf-8")
+        return DocumentChunk.fast_from_dict(self._records[i], text=text)
+
 
 class VectorStore:
     def __init__(self, index_path: Path, metadata_path: Path):
         self.index_path = index_path
         self.metadata_path = metadata_path
-        self.index: faiss.IndexFlatIP | None = None
-        self.metadata: list[DocumentChunk] = []
+        self.index: faiss.Index | None = None
+        self.metadata: Sequence[DocumentChunk] = []
+        self.texts_path = metadata_path.with_suffix(".texts")
+        self.offsets_path = metadata_path.with_suffix(".offsets.npy")
+        # mtime of the metadata file (written last by save) for the files currently in memory.
+        self._disk_version: int | None = None
 
     def build(self, embeddings: np.ndarray, chunks: list[DocumentChunk]) -> None:
+        self.build_from_batches([embeddings], chunks)
+
+    def build_from_batches(self, batches: Iterable[np.ndarray], chunks: list[DocumentChunk]) -> None:
+        """Build the index from embedding batches aligned, in order, with ``chunks``."""
         if len(chunks) == 0:
             raise ValueError("No chunks to index")
-        self.index = faiss.IndexFlatIP(embeddings.shape[1])
-        self.index.add(embeddings)
+        index: faiss.Index | None = None
+        # Quantized indexes must be trained first; hold back batches until there is a sample.
+        pending: list[np.ndarray] = []
+        pending_rows = 0
+        for embeddings in batches:
+            if index is None:
+                index = self._new_index(embeddings.shape[1], len(chunks))
+            if index.is_trained:
+                index.add(embeddings)
+                continue
+            pending.append(embeddings)
+            pending_rows += len(embeddings)
+            if pending_rows >= IVFPQ_TRAIN_SIZE:
+                self._train_and_add(index, pending)
+                pending = []
+        if pending:
+            self._train_and_add(index, pending)
+        if index is None or index.ntotal != len(chunks):
+            raise ValueError("Embedding count does not match chunk count")
+        self.index = index
         self.metadata = chunks
 
+    @staticmethod
+    def _new_index(dim: int, count: int) -> faiss.Index:
+        if count < HNSW_MIN_CHUNKS:
+            return faiss.IndexFlatIP(dim)
+        if count < IVFPQ_MIN_CHUNKS:
+            index = faiss.IndexHNSWFlat(dim, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            return index
+        # PQ needs the dimension to split evenly into sub-quantizers.
+        m = next(m for m in (IVFPQ_M, 32, 24, 16, 12, 8, 4, 2, 1) if dim % m == 0)
+        quantizer = faiss.IndexFlatIP(dim)
+        return faiss.IndexIVFPQ(quantizer, dim, IVFPQ_NLIST, m, IVFPQ_NBITS, faiss.METRIC_INNER_PRODUCT)
+
+    @staticmethod
+    def _train_and_add(index: faiss.Index, batches: list[np.ndarray]) -> None:
+        sample = np.vstack(batches)
+        index.train(sample)
+        index.add(sample)
+
     def save(self) -> None:
         if self.index is None:
             raise RuntimeError("Index not built")
         self.index_path.parent.mkdir(parents=True, exist_ok=True)
         self.metadata_path.parent.mkdir(parents=True, exist_ok=True)
 
-        faiss.write_index(self.index, str(self.index_path))
-        payload = [c.__dict__ for c in self.metadata]
-        self.metadata_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        index_tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        faiss.write_index(self.index, str(index_tmp))
+        os.replace(index_tmp, self.index_path)
+
+        # Texts go in one UTF-8 blob addressed by an offset table; the rest stays as compact JSON.
+        chunks = list(self.metadata)
+        encoded = [c.text.encode("utf-8") for c in chunks]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        records = [{"chunk_id": c.chunk_id, "source": c.source, "title": c.title} for c in chunks]
+
+        # Write-then-rename so a store loaded from these files keeps its mapping valid.
+        _replace(self.texts_path, lambda f: f.write(b"".join(encoded)))
+        _replace(self.offsets_path, lambda f: np.save(f, offsets))
+        _replace(self.metadata_path, lambda f: f.write(_dumps(records)))
+        self._disk_version = self.metadata_path.stat().st_mtime_ns
 
     def load(self) -> None:
-        if not self.index_path.exists() or not self.metadata_path.exists():
+        paths = (self.index_path, self.metadata_path, self.texts_path, self.offsets_path)
+        if not all(p.exists() for p in paths):
             raise FileNotFoundError("Index or metadata file missing")
-        self.index = faiss.read_index(str(self.index_path))
-        raw = json.loads(self.metadata_path.read_text(encoding="utf-8"))
-        self.metadata = [DocumentChunk(**c) for c in raw]
+        for attempt in range(LOAD_ATTEMPTS):
+            if attempt:
+                time.sleep(LOAD_RETRY_DELAY)
+            version = self.metadata_path.stat().st_mtime_ns
+            index = faiss.read_index(str(self.index_path))
+            raw = self.metadata_path.read_bytes()
+            records = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            offsets = np.load(self.offsets_path)
+            with self.texts_path.open("rb") as f:
+                # mmap rejects zero-length files.
+                texts = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if offsets[-1] else b""
+            if index.ntotal == len(records) == len(offsets) - 1 and offsets[-1] == len(texts):
+                break
+        else:
+            raise RuntimeError("Index and metadata files are out of sync")
+        self.index = index
+        self.metadata = _ChunkTable(records, offsets, texts)
+        self._disk_version = version
+
+    def is_stale(self) -> bool:
+        """True when no index is in memory or another process has saved a newer one."""
+        if self.index is None:
+            return True
+        try:
+            return self.metadata_path.stat().st_mtime_ns != self._disk_version
+        except FileNotFoundError:
+            return False
 
     def search(self, query_embedding: np.ndarray, top_k: int) -> list[RetrievedChunk]:
+        return self.search_many(query_embedding[:1], top_k)[0]
+
+    def search_many(self, query_embeddings: np.ndarray, top_k: int) -> list[list[RetrievedChunk]]:
+        """Search all query rows with a single FAISS call; one result list per row."""
         if self.index is None:
             raise RuntimeError("Index is not loaded")
-        scores, ids = self.index.search(query_embedding, top_k)
-        rows: list[RetrievedChunk] = []
-        for score, idx in zip(scores[0], ids[0]):
-            if idx < 0:
-                continue
-            rows.append(RetrievedChunk(chunk=self.metadata[idx], score=float(score)))
-        return rows
+        if isinstance(self.index, faiss.IndexHNSWFlat):
+            self.index.hnsw.efSearch = max(HNSW_EF_SEARCH, top_k)
+        elif isinstance(self.index, faiss.IndexIVF):
+            self.index.nprobe = IVFPQ_NPROBE
+        scores, ids = self.index.search(query_embeddings, top_k)
+        return [self._rows(row_scores, row_ids) for row_scores, row_ids in zip(scores, ids)]
+
+    def _rows(self, scores: np.ndarray, ids: np.ndarray) -> list[RetrievedChunk]:
+        # FAISS pads missing hits with -1; filter in numpy and convert to Python scalars in one go.
+        mask = ids >= 0
+        meta = self.metadata
+        return [
+            RetrievedChunk(chunk=meta[i], score=score)
+            for i, score in zip(ids[mask].tolist(), scores[mask].tolist())
+        ]
+
+
+def _dumps(payload: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _replace(path: Path, write: Callable[[BinaryIO], object]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        write(f)
+    os.replace(tmp, path)
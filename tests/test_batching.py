@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from abap_rag.batching import QueryBatcher
+
+
+def test_concurrent_queries_share_a_batch_and_get_their_own_rows() -> None:
+    batches: list[list[str]] = []
+
+    def retrieve_many(queries: list[str]) -> list[list[str]]:
+        batches.append(list(queries))
+        return [[f"rows for {q}"] for q in queries]
+
+    async def run() -> list[list[str]]:
+        batcher = QueryBatcher(retrieve_many, window_s=0.05)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.retrieve(f"q{i}") for i in range(5)))
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+    assert results == [[f"rows for q{i}"] for i in range(5)]
+    assert batches == [[f"q{i}" for i in range(5)]]
+
+
+def test_errors_reach_every_caller_and_batcher_keeps_running() -> None:
+    calls = 0
+
+    def retrieve_many(queries: list[str]) -> list[list[str]]:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ValueError("index exploded")
+        return [[q] for q in queries]
+
+    async def run() -> tuple[list, list[str]]:
+        batcher = QueryBatcher(retrieve_many, window_s=0.05)
+        batcher.start()
+        try:
+            failed = await asyncio.gather(batcher.retrieve("a"), batcher.retrieve("b"), return_exceptions=True)
+            return failed, await batcher.retrieve("c")
+        finally:
+            await batcher.stop()
+
+    failed, recovered = asyncio.run(run())
+    assert [type(exc) for exc in failed] == [ValueError, ValueError]
+    assert recovered == ["c"]
+
+
+def test_batcher_restarts_on_a_new_event_loop() -> None:
+    batcher = QueryBatcher(lambda queries: [[q] for q in queries])
+
+    async def run(query: str) -> list[str]:
+        batcher.start()
+        try:
+            return await batcher.retrieve(query)
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run("first")) == ["first"]
+    assert asyncio.run(run("second")) == ["second"]
+
+
+def test_retrieve_requires_a_running_batcher() -> None:
+    batcher = QueryBatcher(lambda queries: [[q] for q in queries])
+    with pytest.raises(RuntimeError):
+        asyncio.run(batcher.retrieve("q"))
@@ -0,0 +1,44 @@
+import numpy as np
+
+from abap_rag.cache import SemanticQueryCache
+from abap_rag.models import DocumentChunk, RetrievedChunk
+
+
+def _rows(text: str) -> list[RetrievedChunk]:
+    chunk = DocumentChunk(chunk_id=text, source="x", title="t", text=text)
+    return [RetrievedChunk(chunk=chunk, score=1.0)]
+
+
+def test_cache_exact_and_similar_hits() -> None:
+    cache = SemanticQueryCache(capacity=4, threshold=0.97)
+    emb = np.array([1.0, 0.0], dtype="float32")
+    cache.put("select", emb, _rows("a"))
+
+    assert cache.get("select")[0].chunk.text == "a"
+    near = np.array([0.99, 0.141], dtype="float32")
+    assert cache.get_similar(near / np.linalg.norm(near))[0].chunk.text == "a"
+    assert cache.get_similar(np.array([0.0, 1.0], dtype="float32")) is None
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = SemanticQueryCache(capacity=2, threshold=0.97)
+    cache.put("q1", np.array([1.0, 0.0], dtype="float32"), _rows("a"))
+    cache.put("q2", np.array([0.0, 1.0], dtype="float32"), _rows("b"))
+    cache.get("q1")
+    cache.put("q3", np.array([0.6, 0.8], dtype="float32"), _rows("c"))
+
+    assert len(cache) == 2
+    assert cache.get("q2") is None
+    assert cache.get("q1") is not None
+    assert cache.get_similar(np.array([0.0, 1.0], dtype="float32")) is None
+
+
+def test_cache_drops_results_computed_before_clear() -> None:
+    cache = SemanticQueryCache(capacity=2, threshold=0.97)
+    generation = cache.generation
+    cache.clear()
+    cache.put("q1", np.array([1.0, 0.0], dtype="float32"), _rows("stale"), generation=generation)
+
+    assert cache.get("q1") is None
+    cache.put("q1", np.array([1.0, 0.0], dtype="float32"), _rows("fresh"), generation=cache.generation)
+    assert cache.get("q1")[0].chunk.text == "fresh"
@@ -15,3 +15,14 @@ def test_chunk_validation() -> None:
         assert True
     else:
         assert False
+
+
+def test_chunk_title_uses_first_heading_line() -> None:
+    chunks = chunk_document("doc", "## SELECT basics ##\nSELECT * FROM mara.", chunk_size=500, overlap=50)
+    assert chunks[0].title == "SELECT basics"
+
+
+def test_chunk_title_splits_on_the_same_breaks_as_splitlines() -> None:
+    for text in ("b\u2028a", "Page 1\fPage 2", "Title\x85body", "Head\vmore"):
+        chunk = chunk_document("doc", text, chunk_size=500, overlap=50)[0]
+        assert chunk.title == text.splitlines()[0]
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+
+from abap_rag.embedder import CachedEmbedder  # noqa: E402
+
+
+class CountingEmbedder:
+    def __init__(self, model_name: str = "fake-model") -> None:
+        self.model_name = model_name
+        self.calls: list[list[str]] = []
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        return np.asarray([[len(t), sum(map(ord, t)) % 97, 1.0] for t in texts], dtype="float32")
+
+
+def test_second_encode_is_served_from_cache_in_input_order(tmp_path) -> None:
+    model = CountingEmbedder()
+    cached = CachedEmbedder(model, tmp_path / "embeddings.sqlite")
+    texts = ["SELECT", "LOOP AT itab", "READ TABLE", "SELECT"]
+
+    first = cached.encode(texts)
+    assert model.calls == [["SELECT", "LOOP AT itab", "READ TABLE"]]
+
+    reordered = texts[::-1]
+    second = cached.encode(reordered)
+    assert len(model.calls) == 1
+    np.testing.assert_array_equal(first, model.encode(texts))
+    np.testing.assert_array_equal(second, first[::-1])
+
+
+def test_cache_is_shared_across_instances_and_batches_lookups(tmp_path) -> None:
+    texts = [f"chunk {i}" for i in range(2000)]
+    CachedEmbedder(CountingEmbedder(), tmp_path / "embeddings.sqlite").encode(texts)
+
+    model = CountingEmbedder()
+    out = CachedEmbedder(model, tmp_path / "embeddings.sqlite").encode(texts)
+    assert model.calls == []
+    np.testing.assert_array_equal(out, CountingEmbedder().encode(texts))
+
+
+def test_different_model_name_misses_cache(tmp_path) -> None:
+    CachedEmbedder(CountingEmbedder("model-a"), tmp_path / "embeddings.sqlite").encode(["SELECT"])
+
+    other = CountingEmbedder("model-b")
+    CachedEmbedder(other, tmp_path / "embeddings.sqlite").encode(["SELECT"])
+    assert other.calls == [["SELECT"]]
@@ -7,3 +7,10 @@ def test_generator_with_context() -> None:
     out = PromptGenerator.generate("how to query", [RetrievedChunk(chunk=chunk, score=0.9)])
     assert "Question:" in out
     assert "ABAP SELECT example" in out
+
+
+def test_generator_truncates_long_context() -> None:
+    chunk = DocumentChunk(chunk_id="1", source="x", title="t", text="A\n" * 1000)
+    out = PromptGenerator.generate("q", [RetrievedChunk(chunk=chunk, score=0.5)])
+    assert ("A " * 250).rstrip() in out
+    assert "A " * 251 not in out
@@ -0,0 +1,13 @@
+from abap_rag.loader import load_text_documents
+
+
+def test_load_text_documents_filters_and_normalizes(tmp_path) -> None:
+    (tmp_path / "report.abap").write_bytes(b"REPORT z1.\r\nWRITE 'x'.")
+    (tmp_path / "empty.md").write_bytes(b"")
+    (tmp_path / "skip.py").write_text("print()")
+
+    docs = dict(load_text_documents(tmp_path))
+    assert docs == {
+        str(tmp_path / "report.abap"): "REPORT z1.\nWRITE 'x'.",
+        str(tmp_path / "empty.md"): "",
+    }
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+
+import abap_rag.pipeline as pipeline_module  # noqa: E402
+from abap_rag.settings import Settings  # noqa: E402
+
+
+class FakeEmbedder:
+    def __init__(self, model_name: str, **kwargs) -> None:
+        self.model_name = model_name
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        return np.asarray([[len(t), 1.0] for t in texts], dtype="float32")
+
+
+def _pipeline(tmp_path, monkeypatch, **overrides) -> pipeline_module.RagPipeline:
+    monkeypatch.setattr(pipeline_module, "Embedder", FakeEmbedder)
+    settings = Settings(
+        index_path=tmp_path / "store" / "faiss.index",
+        metadata_path=tmp_path / "store" / "metadata.json",
+        embedding_cache_path=tmp_path / "store" / "embeddings.sqlite",
+        chunk_size=50,
+        chunk_overlap=10,
+        # Small batches so ingest streams several embedding batches into the index.
+        **{"ingest_batch_size": 4, **overrides},
+    )
+    return pipeline_module.RagPipeline(settings)
+
+
+def _docs(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(3):
+        (docs / f"doc{i}.abap").write_text(f"REPORT z{i}.\n" + "WRITE 'x'. " * 20)
+    return docs
+
+
+def test_small_ingest_chunks_in_process(tmp_path, monkeypatch) -> None:
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool should not start for a small corpus")
+
+    monkeypatch.setattr(pipeline_module, "ProcessPoolExecutor", no_pool)
+    pipeline = _pipeline(tmp_path, monkeypatch, ingest_workers=2)
+    assert pipeline.ingest(_docs(tmp_path)) > 3
+
+
+def test_parallel_ingest_matches_in_process(tmp_path, monkeypatch) -> None:
+    docs = _docs(tmp_path)
+    serial = _pipeline(tmp_path / "a", monkeypatch, ingest_workers=1)
+    parallel = _pipeline(tmp_path / "b", monkeypatch, ingest_workers=2, ingest_parallel_min_chars=0)
+
+    assert serial.ingest(docs) == parallel.ingest(docs)
+    assert list(serial.vector_store.metadata) == list(parallel.vector_store.metadata)
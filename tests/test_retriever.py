@@ -0,0 +1,59 @@
+import numpy as np
+
+from abap_rag.cache import SemanticQueryCache
+from abap_rag.models import DocumentChunk
+from abap_rag.retriever import Retriever
+from abap_rag.vector_store import VectorStore
+
+VECTORS = {
+    "select": [1.0, 0.0, 0.0],
+    "select rows": [0.995, 0.0998, 0.0],
+    "loop": [0.0, 1.0, 0.0],
+}
+
+
+class FakeEmbedder:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        return np.asarray([VECTORS[t] for t in texts], dtype="float32")
+
+
+def _retriever(tmp_path, cache: SemanticQueryCache | None) -> tuple[Retriever, FakeEmbedder]:
+    chunks = [DocumentChunk(chunk_id=f"d:{i}", source="d", title="t", text=str(i)) for i in range(3)]
+    store = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    store.build(embeddings=np.eye(3, dtype="float32"), chunks=chunks)
+    embedder = FakeEmbedder()
+    return Retriever(embedder=embedder, vector_store=store, top_k=1, cache=cache), embedder
+
+
+def test_retrieve_many_uses_exact_and_semantic_cache(tmp_path) -> None:
+    retriever, embedder = _retriever(tmp_path, SemanticQueryCache(capacity=8, threshold=0.97))
+
+    first = retriever.retrieve_many(["select", "loop"])
+    assert [rows[0].chunk.chunk_id for rows in first] == ["d:0", "d:1"]
+    assert embedder.calls == [["select", "loop"]]
+
+    assert retriever.retrieve("select")[0].chunk.chunk_id == "d:0"
+    assert len(embedder.calls) == 1
+
+    assert retriever.retrieve("select rows")[0].chunk.chunk_id == "d:0"
+    assert embedder.calls[-1] == ["select rows"]
+    assert retriever.cache.get("select rows") is None
+
+
+def test_retrieve_many_does_not_cache_across_clear(tmp_path) -> None:
+    cache = SemanticQueryCache(capacity=8, threshold=0.97)
+    retriever, _ = _retriever(tmp_path, cache)
+    search_many = retriever.vector_store.search_many
+
+    def search_then_clear(*args, **kwargs):
+        rows = search_many(*args, **kwargs)
+        cache.clear()
+        return rows
+
+    retriever.vector_store.search_many = search_then_clear
+    assert retriever.retrieve("loop")[0].chunk.chunk_id == "d:1"
+    assert len(cache) == 0
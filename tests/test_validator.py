@@ -23,6 +23,11 @@ class ValidatorTests(unittest.TestCase):
         reports = ABAPRAGValidator({}, design).run_improvement_loop(max_iterations=1, apply_fixes=False)
         self.assertFalse(reports[-1].passed)
 
+    def test_loop_stops_when_no_fixes_are_applied(self):
+        design = {"chunking": {"strategy": "fixed"}}
+        reports = ABAPRAGValidator({}, design).run_improvement_loop(max_iterations=3, apply_fixes=False)
+        self.assertEqual(len(reports), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,164 @@
+import os
+
+import faiss
+import numpy as np
+import pytest
+
+import abap_rag.vector_store as vector_store
+from abap_rag.models import DocumentChunk
+from abap_rag.vector_store import VectorStore
+
+
+def _unit_vectors(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    vecs = np.random.default_rng(seed).normal(size=(n, dim)).astype("float32")
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def _chunks(n: int) -> list[DocumentChunk]:
+    return [DocumentChunk(chunk_id=f"d:{i}", source="d", title="t", text=f"text {i}") for i in range(n)]
+
+
+def test_save_and_load_round_trip(tmp_path) -> None:
+    chunks = [
+        DocumentChunk(chunk_id="a:0", source="a", title="SELECT", text="SELECT * FROM mara."),
+        DocumentChunk(chunk_id="b:0", source="b", title="Tables", text="Sorted tables – schnell"),
+    ]
+    embeddings = np.eye(2, 4, dtype="float32")
+    store = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    store.build(embeddings=embeddings, chunks=chunks)
+    store.save()
+
+    loaded = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    loaded.load()
+    assert list(loaded.metadata) == chunks
+    rows = loaded.search(embeddings[1:2], top_k=1)
+    assert rows[0].chunk == chunks[1]
+
+
+def test_search_many_returns_one_result_list_per_query(tmp_path) -> None:
+    chunks = [DocumentChunk(chunk_id=f"d:{i}", source="d", title="t", text=str(i)) for i in range(3)]
+    embeddings = np.eye(3, dtype="float32")
+    store = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    store.build(embeddings=embeddings, chunks=chunks)
+
+    results = store.search_many(embeddings[[2, 0]], top_k=1)
+    assert [rows[0].chunk.chunk_id for rows in results] == ["d:2", "d:0"]
+
+
+def test_search_skips_padding_when_top_k_exceeds_index(tmp_path) -> None:
+    chunks = [DocumentChunk(chunk_id=f"d:{i}", source="d", title="t", text=str(i)) for i in range(2)]
+    store = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    store.build(embeddings=np.eye(2, dtype="float32"), chunks=chunks)
+
+    rows = store.search(np.eye(1, 2, dtype="float32"), top_k=5)
+    assert [row.chunk.chunk_id for row in rows] == ["d:0", "d:1"]
+    assert all(isinstance(row.score, float) for row in rows)
+
+
+def test_is_stale_after_another_store_saves(tmp_path) -> None:
+    chunks = [DocumentChunk(chunk_id="d:0", source="d", title="t", text="x")]
+    writer = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    writer.build(embeddings=np.eye(1, 2, dtype="float32"), chunks=chunks)
+    writer.save()
+
+    reader = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    assert reader.is_stale()
+    reader.load()
+    assert not reader.is_stale()
+
+    os.utime(tmp_path / "metadata.json", ns=(0, 0))
+    assert reader.is_stale()
+
+
+def test_large_index_uses_hnsw_and_survives_save_load(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(vector_store, "HNSW_MIN_CHUNKS", 5)
+    embeddings = _unit_vectors(10, 8)
+    store = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    store.build(embeddings=embeddings, chunks=_chunks(10))
+
+    assert isinstance(store.index, faiss.IndexHNSWFlat)
+    assert store.index.metric_type == faiss.METRIC_INNER_PRODUCT
+    store.search(embeddings[:1], top_k=4)
+    assert store.index.hnsw.efSearch == vector_store.HNSW_EF_SEARCH
+    store.search(embeddings[:1], top_k=100)
+    assert store.index.hnsw.efSearch == 100
+    store.save()
+
+    loaded = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    loaded.load()
+    assert isinstance(loaded.index, faiss.IndexHNSWFlat)
+    assert loaded.search(embeddings[3:4], top_k=1)[0].chunk.chunk_id == "d:3"
+
+
+def test_small_index_stays_flat(tmp_path) -> None:
+    store = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    store.build(embeddings=_unit_vectors(10, 8), chunks=_chunks(10))
+    assert isinstance(store.index, faiss.IndexFlatIP)
+
+
+def test_build_from_batches_rejects_missing_embeddings(tmp_path) -> None:
+    embeddings = _unit_vectors(3, 8)
+    store = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    with pytest.raises(ValueError, match="does not match chunk count"):
+        store.build_from_batches([embeddings[:2], embeddings[2:2]], _chunks(3))
+    assert store.index is None
+
+
+def test_load_rejects_index_from_another_save(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(vector_store, "LOAD_RETRY_DELAY", 0)
+    store = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    store.build(embeddings=_unit_vectors(2, 8), chunks=_chunks(2))
+    store.save()
+    other = VectorStore(tmp_path / "other" / "faiss.index", tmp_path / "other" / "metadata.json")
+    other.build(embeddings=_unit_vectors(3, 8), chunks=_chunks(3))
+    other.save()
+
+    reader = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    reader.load()
+    os.replace(other.index_path, store.index_path)
+    with pytest.raises(RuntimeError, match="out of sync"):
+        reader.load()
+    assert reader.index.ntotal == len(reader.metadata) == 2
+
+
+def _small_ivfpq(monkeypatch) -> None:
+    monkeypatch.setattr(vector_store, "HNSW_MIN_CHUNKS", 10)
+    monkeypatch.setattr(vector_store, "IVFPQ_MIN_CHUNKS", 100)
+    monkeypatch.setattr(vector_store, "IVFPQ_NLIST", 4)
+    monkeypatch.setattr(vector_store, "IVFPQ_TRAIN_SIZE", 300)
+
+
+def test_huge_index_uses_ivfpq_and_survives_save_load(tmp_path, monkeypatch) -> None:
+    _small_ivfpq(monkeypatch)
+    # 20 dims do not split into 48 sub-quantizers, so PQ falls back to the next divisor (4).
+    embeddings = _unit_vectors(500, 20)
+    sizes = [100, 50, 200, 150]
+    bounds = np.cumsum([0, *sizes])
+    batches = [embeddings[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+    store = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    store.build_from_batches(batches, _chunks(500))
+
+    assert isinstance(store.index, faiss.IndexIVFPQ)
+    assert store.index.ntotal == 500
+    assert store.index.pq.M == 4
+    store.search(embeddings[:1], top_k=5)
+    assert store.index.nprobe == vector_store.IVFPQ_NPROBE
+    store.save()
+
+    loaded = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    loaded.load()
+    assert isinstance(loaded.index, faiss.IndexIVFPQ)
+    hits = [row.chunk.chunk_id for row in loaded.search(embeddings[7:8], top_k=10)]
+    assert "d:7" in hits
+
+
+def test_ivfpq_trains_on_short_stream(tmp_path, monkeypatch) -> None:
+    _small_ivfpq(monkeypatch)
+    # Fewer rows than IVFPQ_TRAIN_SIZE: training happens once the stream ends.
+    embeddings = _unit_vectors(280, 20)
+    store = VectorStore(tmp_path / "faiss.index", tmp_path / "metadata.json")
+    store.build_from_batches([embeddings[:130], embeddings[130:]], _chunks(280))
+
+    assert isinstance(store.index, faiss.IndexIVFPQ)
+    assert store.index.is_trained
+    assert store.index.ntotal == 280